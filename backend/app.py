@@ -2,20 +2,42 @@ from flask import Flask, request, jsonify, Response
 from flask_cors import CORS, cross_origin
 import os
 import json
+import math
+import re
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
 import google.generativeai as genai
 from dotenv import load_dotenv
+try:
+    import orjson  # C-implemented JSON encoder for the high-frequency endpoints
+except ImportError:
+    orjson = None
+try:
+    import redis
+except ImportError:
+    redis = None
 import asyncio
 import websockets
 import base64
+import binascii
+import logging
+import queue
 import numpy as np
+import threading
 from threading import Thread
 import time
 
 # Load environment variables
 load_dotenv()
 
+# Leveled logging; at the default INFO the debug messages on the hot path
+# are never formatted, let alone written
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+log = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
 # Simplified CORS configuration
@@ -25,34 +47,304 @@ CORS(app, origins=["http://localhost:3000"], supports_credentials=True)
 genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 model = genai.GenerativeModel('gemini-2.0-flash-exp')
 
+# Scale factor for int16 -> float32 PCM conversion, precomputed once
+_INV_32768 = np.float32(1.0 / 32768.0)
+
+# int16 peak below which a frame is treated as silence and skips RMS entirely
+SILENCE_I16 = 80
+
+# Live stats live in a flat float32 array instead of a dict; this is the
+# index layout, with named constants for the hot-path code
+STAT_IDX = {
+    'fluency': 0,
+    'volume': 1,
+    'articulation': 2,
+    'filler_words': 3,
+    'speaking_rate': 4,
+    'confidence': 5,
+    'clarity': 6,
+}
+_FLUENCY, _VOLUME, _ARTICULATION, _FILLER_WORDS, _SPEAKING_RATE, _CONFIDENCE, _CLARITY = range(7)
+
+# Common filler words, matched on word boundaries so "soul" doesn't count as "so"
+FILLER_RE = re.compile(r'\b(?:um|uh|like|you know|so|well|actually|basically|literally)\b', re.IGNORECASE)
+
+# Keep only the most recent analyses per session so long-lived sessions
+# don't accumulate Gemini responses forever
+ANALYSIS_HISTORY_MAX = 20
+
+# Gemini analysis runs on this pool so request workers aren't pinned on a
+# remote round-trip; the frontend polls /analysis for the result
+ANALYSIS_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Strips markdown code fences (``` / ```json) that Gemini wraps around JSON
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.S)
+
+# Coaching prompt template, built once instead of per request
+_COACH_PROMPT_TEMPLATE = """
+        As an expert speech coach, analyze this speaking performance:
+
+        TRANSCRIPT: "{transcript}"
+
+        LIVE STATISTICS:
+        - Fluency Score: {fluency}/100
+        - Volume Level: {volume}/100
+        - Articulation: {articulation}/100
+        - Filler Words: {filler_words}%
+        - Speaking Rate: {speaking_rate} WPM
+        - Confidence: {confidence}/100
+        - Clarity: {clarity}/100
+
+        SESSION COUNT: {session_count} (previous sessions)
+
+        Please provide coaching feedback in this EXACT JSON format:
+        {{
+            "observations": [
+                "Specific observation about tone/delivery",
+                "Observation about word choice/clarity",
+                "Observation about pacing/flow"
+            ],
+            "improvements": [
+                "Specific actionable tip",
+                "Another concrete suggestion"
+            ],
+            "strengths": [
+                "What they did well"
+            ],
+            "overall_score": 7,
+            "quick_tip": "One-sentence practical advice",
+            "progress_notes": "Comment on improvement from previous sessions (if any)"
+        }}
+
+        Be encouraging but honest. Focus on practical, actionable advice.
+        """
+
+# Stat-calculation constants, hoisted out of the per-chunk hot path
+_COMPLEX_WORD_MIN = 5  # words this long count towards articulation
+_ARTIC_ALPHA = 0.3  # smoothing factor for the articulation score
+
+def _update_stats(stats, total_words, filler_count, elapsed_minutes, complex_count, new_word_count):
+    """Numeric core of update_live_stats, operating on the float32[7] array.
+
+    Kept free of Python objects so Numba can compile it when installed.
+    """
+    if elapsed_minutes > 0:
+        stats[_SPEAKING_RATE] = total_words / elapsed_minutes
+    if total_words > 0:
+        stats[_FILLER_WORDS] = (filler_count / total_words) * 100.0
+    else:
+        stats[_FILLER_WORDS] = 0.0
+    if new_word_count > 0:
+        articulation_score = complex_count * 100.0 / new_word_count
+        stats[_ARTICULATION] = (stats[_ARTICULATION] * (1.0 - _ARTIC_ALPHA)) + (articulation_score * _ARTIC_ALPHA)
+    stats[_FLUENCY] = max(0.0, 100.0 - (stats[_FILLER_WORDS] * 1.5))
+    stats[_CONFIDENCE] = (stats[_VOLUME] * 0.4) + (stats[_FLUENCY] * 0.6)
+    stats[_CLARITY] = (stats[_ARTICULATION] * 0.6) + (stats[_FLUENCY] * 0.4)
+    # Clamp everything to 0-100
+    for i in range(stats.size):
+        if stats[i] < 0.0:
+            stats[i] = 0.0
+        elif stats[i] > 100.0:
+            stats[i] = 100.0
+
+try:
+    import numba
+    _update_stats = numba.njit(cache=True, fastmath=True)(_update_stats)
+except ImportError:
+    pass  # pure-Python fallback is identical, just slower
+
 # In-memory storage (use a database in production)
-transcriptions = []
-active_sessions = {}  # Store active voice analysis sessions
+transcriptions = OrderedDict()  # id -> transcription record, insertion-ordered
+
+# Active voice analysis sessions, sharded with striped locks so concurrent
+# request threads don't contend on (or race) a single shared dict
+_SESSION_SHARDS = 16
+_session_locks = [threading.Lock() for _ in range(_SESSION_SHARDS)]
+_session_shards = [{} for _ in range(_SESSION_SHARDS)]
+
+# Optional shared session store: when REDIS_URL is set, session state is
+# persisted to Redis so any worker process can serve any session. Without
+# it the in-memory shards behave exactly as before (single worker only).
+_redis = None
+if redis is not None and os.getenv('REDIS_URL'):
+    _redis = redis.Redis.from_url(os.getenv('REDIS_URL'))
+_REDIS_SESSION_TTL = 3600  # seconds a session survives without activity
+_REDIS_FLUSH_EVERY = 10  # audio chunks between write-backs on the hot path
+
+def _session_bucket(session_id):
+    idx = hash(session_id) % _SESSION_SHARDS
+    return _session_shards[idx], _session_locks[idx]
+
+def _get_session(session_id):
+    shard, lock = _session_bucket(session_id)
+    with lock:
+        session = shard.get(session_id)
+    if _redis is None:
+        return session
+    # Redis is authoritative across workers: re-read the snapshot on every
+    # lookup and adopt it whenever another worker has written a newer
+    # revision. The local copy wins only while it is ahead of the store
+    # (unflushed throttled chunks), so hot-path counters never regress.
+    try:
+        payload = _redis.get(f'sess:{session_id}')
+    except Exception as e:
+        log.error("Redis load failed: %s", e)
+        return session
+    if not payload:
+        return session
+    state = json.loads(payload)
+    if session is not None and session._rev >= state.get('rev', 0):
+        return session
+    fresh = VoiceAnalysisSession.from_state(state)
+    if session is not None:
+        # Carry over worker-local state that never round-trips the store
+        fresh.pending_analysis = session.pending_analysis
+        fresh._dirty_chunks = session._dirty_chunks
+    with lock:
+        shard[session_id] = fresh
+    return fresh
+
+def _put_session(session):
+    shard, lock = _session_bucket(session.session_id)
+    with lock:
+        shard[session.session_id] = session
+    _save_session(session)
+
+def _pop_session(session_id):
+    shard, lock = _session_bucket(session_id)
+    with lock:
+        session = shard.pop(session_id, None)
+    if _redis is not None:
+        try:
+            _redis.delete(f'sess:{session_id}')
+        except Exception as e:
+            log.error("Redis delete failed: %s", e)
+    return session
+
+def _save_session(session, throttled=False):
+    """Write session state to the shared store, if one is configured.
+
+    On the audio hot path (throttled=True) the write-back only happens
+    every _REDIS_FLUSH_EVERY chunks to avoid a Redis round-trip per frame.
+    """
+    if _redis is None:
+        return
+    if throttled:
+        session._dirty_chunks += 1
+        if session._dirty_chunks < _REDIS_FLUSH_EVERY:
+            return
+    session._dirty_chunks = 0
+    session._rev += 1  # newer revision: other workers adopt it on next read
+    state = session.to_state()
+    payload = orjson.dumps(state) if orjson is not None else json.dumps(state)
+    try:
+        _redis.set(f'sess:{session.session_id}', payload, ex=_REDIS_SESSION_TTL)
+    except Exception as e:
+        log.error("Redis save failed: %s", e)
+
+def _session_count():
+    return sum(len(shard) for shard in _session_shards)
+
+def ojson(obj, status=200):
+    """Fast JSON response for the high-frequency polling endpoints"""
+    if orjson is not None:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj)
+    return Response(body, status=status, mimetype='application/json')
+
+class Float32Pool:
+    """Pool of reusable float32 buffers for fixed-size audio chunks"""
+    def __init__(self, size, max_buffers=32):
+        self.size = size
+        self.q = queue.LifoQueue(max_buffers)
+
+    def acquire(self):
+        try:
+            return self.q.get_nowait()
+        except queue.Empty:
+            return np.empty(self.size, dtype=np.float32)
+
+    def release(self, buf):
+        try:
+            self.q.put_nowait(buf)
+        except queue.Full:
+            pass  # Pool is full, let the buffer be garbage collected
+
+AUDIO_CHUNK_SAMPLES = 1600  # ~100ms at 16kHz, the standard client frame size
+AUDIO_POOL = Float32Pool(AUDIO_CHUNK_SAMPLES)
 
 class VoiceAnalysisSession:
     def __init__(self, session_id):
         self.session_id = session_id
         self.is_recording = False
-        self.audio_buffer = []
-        self.transcript = ""
-        self.live_stats = {
-            "fluency": 0,
-            "volume": 0,
-            "articulation": 0,
-            "filler_words": 0,
-            "speaking_rate": 0,
-            "confidence": 0,
-            "clarity": 0
-        }
-        self.analysis_history = []
+        # Streaming RMS accumulators - no raw audio is retained per session
+        self._sumsq = 0.0
+        self._nsamples = 0
+        self._transcript_parts = []  # joined lazily by the transcript property
+        self.live_stats = np.zeros(7, dtype=np.float32)  # indexed via STAT_IDX
+        self.analysis_history = deque(maxlen=ANALYSIS_HISTORY_MAX)
+        self.pending_analysis = None  # Future for an in-flight Gemini analysis
         self.start_time = None
         self.total_words = 0
         self.filler_count = 0
-        
+        self._dirty_chunks = 0  # audio chunks since the last store write-back
+        self._rev = 0  # store snapshot revision, bumped on every write-back
+
+    def to_state(self):
+        """Serializable snapshot for the shared session store"""
+        return {
+            'session_id': self.session_id,
+            'is_recording': self.is_recording,
+            'transcript_parts': self._transcript_parts,
+            'live_stats': [float(v) for v in self.live_stats],
+            'analysis_history': list(self.analysis_history),
+            'start_time': self.start_time,
+            'total_words': self.total_words,
+            'filler_count': self.filler_count,
+            'sumsq': self._sumsq,
+            'nsamples': self._nsamples,
+            'rev': self._rev,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        session = cls(state['session_id'])
+        session.is_recording = state['is_recording']
+        session._transcript_parts = list(state['transcript_parts'])
+        session.live_stats[:] = state['live_stats']
+        session.analysis_history.extend(state['analysis_history'])
+        session.start_time = state['start_time']
+        session.total_words = state['total_words']
+        session.filler_count = state['filler_count']
+        session._sumsq = state.get('sumsq', 0.0)
+        session._nsamples = state.get('nsamples', 0)
+        session._rev = state.get('rev', 0)
+        return session
+
+
+    @property
+    def transcript(self):
+        """Full transcript, joined on demand from the accumulated chunks"""
+        return ' '.join(self._transcript_parts)
+
+    def stats_dict(self):
+        """Named view of the live stats array, built only at response time"""
+        stats = self.live_stats
+        return {name: float(stats[idx]) for name, idx in STAT_IDX.items()}
+
+    @property
+    def overall_rms(self):
+        """RMS over all audio seen this recording - O(1) from the accumulators"""
+        if self._nsamples == 0:
+            return 0.0
+        return math.sqrt(self._sumsq / self._nsamples)
+
     def start_recording(self):
         self.is_recording = True
         self.start_time = time.time()
-        self.audio_buffer = []
+        self._sumsq = 0.0
+        self._nsamples = 0
         
     def stop_recording(self):
         self.is_recording = False
@@ -60,112 +352,87 @@ class VoiceAnalysisSession:
     def update_live_stats(self, audio_chunk, text_chunk=""):
         """Update real-time statistics"""
         try:
+            stats = self.live_stats
             if audio_chunk is not None and len(audio_chunk) > 0:
-                # Calculate volume (RMS) - handle different audio formats
-                if isinstance(audio_chunk, np.ndarray):
-                    rms = np.sqrt(np.mean(audio_chunk**2))
-                else:
-                    # Convert to numpy array if it's not already
-                    audio_array = np.array(audio_chunk, dtype=np.float32)
-                    if len(audio_array) > 0:
-                        rms = np.sqrt(np.mean(audio_array**2))
-                    else:
-                        rms = 0
-                
+                # Calculate volume (RMS) via dot product - no squared-array
+                # temporary - and feed the whole-session accumulators with
+                # the same pass (BLAS sdot)
+                if not isinstance(audio_chunk, np.ndarray):
+                    audio_chunk = np.asarray(audio_chunk, dtype=np.float32)
+                chunk_sumsq = float(np.dot(audio_chunk, audio_chunk))
+                self._sumsq += chunk_sumsq
+                self._nsamples += audio_chunk.size
+                rms = math.sqrt(chunk_sumsq / audio_chunk.size)
+
                 # Normalize volume to 0-100 scale
-                volume_score = min(100, max(0, rms * 500))
-                self.live_stats["volume"] = volume_score
-                print(f"Volume calculated: {volume_score}")
-                
+                stats[_VOLUME] = min(100, max(0, rms * 500))
+                log.debug("Volume calculated: %s", stats[_VOLUME])
+
             if text_chunk and text_chunk.strip():
-                print(f"Processing text: '{text_chunk}'")
-                
-                # Update transcript
-                self.transcript += " " + text_chunk.strip()
-                print(f"Updated transcript: '{self.transcript}'")
-                
+                log.debug("Processing text: '%s'", text_chunk)
+
+                # Update transcript - O(1) append, joined only when read
+                self._transcript_parts.append(text_chunk.strip())
+                log.debug("Transcript chunks: %s", len(self._transcript_parts))
+
                 # Count words and filler words
                 words = text_chunk.lower().strip().split()
                 new_word_count = len(words)
                 self.total_words += new_word_count
-                print(f"New words: {new_word_count}, Total words: {self.total_words}")
-                
-                # Common filler words
-                filler_words = ['um', 'uh', 'like', 'you know', 'so', 'well', 'actually', 'basically', 'literally']
-                new_fillers = sum(1 for word in words if any(filler in word for filler in filler_words))
+                log.debug("New words: %s, Total words: %s", new_word_count, self.total_words)
+
+                new_fillers = len(FILLER_RE.findall(text_chunk))
                 self.filler_count += new_fillers
-                print(f"New fillers: {new_fillers}, Total fillers: {self.filler_count}")
-                
-                # Calculate speaking rate (words per minute)
+                log.debug("New fillers: %s, Total fillers: %s", new_fillers, self.filler_count)
+
+                # Run the numeric core (speaking rate, filler percentage,
+                # articulation, fluency, confidence, clarity + clamp) over
+                # the stats array in one compiled call
                 if self.start_time:
                     elapsed_minutes = (time.time() - self.start_time) / 60
-                    if elapsed_minutes > 0:
-                        self.live_stats["speaking_rate"] = self.total_words / elapsed_minutes
-                        print(f"Speaking rate: {self.live_stats['speaking_rate']} WPM")
-                        
-                # Calculate filler word percentage
-                if self.total_words > 0:
-                    self.live_stats["filler_words"] = (self.filler_count / self.total_words) * 100
                 else:
-                    self.live_stats["filler_words"] = 0
-                print(f"Filler percentage: {self.live_stats['filler_words']}%")
-                    
-                # Calculate articulation score (based on word complexity)
-                if new_word_count > 0:
-                    complex_words = [w for w in words if len(w) > 4]
-                    articulation_score = (len(complex_words) / new_word_count) * 100
-                    # Smooth the articulation score with previous values
-                    self.live_stats["articulation"] = (self.live_stats["articulation"] * 0.7) + (articulation_score * 0.3)
-                    print(f"Articulation: {self.live_stats['articulation']}")
-                
-                # Calculate fluency (inverse relationship with filler words)
-                self.live_stats["fluency"] = max(0, 100 - (self.live_stats["filler_words"] * 1.5))
-                print(f"Fluency: {self.live_stats['fluency']}")
-                
-                # Calculate confidence (combination of volume and fluency)
-                self.live_stats["confidence"] = (self.live_stats["volume"] * 0.4) + (self.live_stats["fluency"] * 0.6)
-                print(f"Confidence: {self.live_stats['confidence']}")
-                
-                # Calculate clarity (combination of articulation and fluency)
-                self.live_stats["clarity"] = (self.live_stats["articulation"] * 0.6) + (self.live_stats["fluency"] * 0.4)
-                print(f"Clarity: {self.live_stats['clarity']}")
-                
-                # Ensure all values are within 0-100 range
-                for key in self.live_stats:
-                    self.live_stats[key] = max(0, min(100, self.live_stats[key]))
-                    
+                    elapsed_minutes = 0.0
+                complex_count = sum(1 for w in words if len(w) >= _COMPLEX_WORD_MIN)
+                _update_stats(stats, self.total_words, self.filler_count,
+                              elapsed_minutes, complex_count, new_word_count)
+                log.debug("Derived stats updated: %s", stats)
+
             # If we have minimal data, generate some base stats for testing
             if self.is_recording and self.total_words == 0 and not text_chunk:
                 # Generate some baseline stats when recording but no text yet
                 import random
-                self.live_stats["volume"] = max(self.live_stats["volume"], random.uniform(30, 70))
-                self.live_stats["fluency"] = max(self.live_stats["fluency"], random.uniform(40, 80))
-                self.live_stats["articulation"] = max(self.live_stats["articulation"], random.uniform(50, 85))
-                self.live_stats["confidence"] = (self.live_stats["volume"] * 0.4) + (self.live_stats["fluency"] * 0.6)
-                self.live_stats["clarity"] = (self.live_stats["articulation"] * 0.6) + (self.live_stats["fluency"] * 0.4)
-                print("Generated baseline stats for testing")
+                stats[_VOLUME] = max(stats[_VOLUME], random.uniform(30, 70))
+                stats[_FLUENCY] = max(stats[_FLUENCY], random.uniform(40, 80))
+                stats[_ARTICULATION] = max(stats[_ARTICULATION], random.uniform(50, 85))
+                stats[_CONFIDENCE] = (stats[_VOLUME] * 0.4) + (stats[_FLUENCY] * 0.6)
+                stats[_CLARITY] = (stats[_ARTICULATION] * 0.6) + (stats[_FLUENCY] * 0.4)
+                log.debug("Generated baseline stats for testing")
                     
         except Exception as e:
-            print(f"Error updating live stats: {e}")
+            log.error("Error updating live stats: %s", e)
             # Don't crash, just maintain current stats
 
+# CORS headers and CSP (with audio API fixes), built once at import time
+_RESPONSE_HEADERS = [
+    ('Access-Control-Allow-Origin', 'http://localhost:3000'),
+    ('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Requested-With'),
+    ('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS'),
+    ('Access-Control-Allow-Credentials', 'true'),
+    ('Content-Security-Policy',
+     "default-src 'self'; "
+     "script-src 'self' 'unsafe-eval' 'unsafe-inline'; "
+     "style-src 'self' 'unsafe-inline'; "
+     "media-src 'self' blob:; "
+     "connect-src 'self' http://localhost:3000"),
+]
+
 # Remove duplicate @app.after_request - keep only one
 @app.after_request
 def after_request(response):
-    # Set CORS headers and CSP in one place
-    response.headers['Access-Control-Allow-Origin'] = 'http://localhost:3000'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,X-Requested-With'
-    response.headers['Access-Control-Allow-Methods'] = 'GET,PUT,POST,DELETE,OPTIONS'
-    response.headers['Access-Control-Allow-Credentials'] = 'true'
-    
-    # Fix CSP for audio APIs
-    response.headers['Content-Security-Policy'] = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-eval' 'unsafe-inline'; "
-        "style-src 'self' 'unsafe-inline'; "
-        "media-src 'self' blob:; "
-        "connect-src 'self' http://localhost:3000"
-    )
+    # Assign the precomputed CORS/CSP headers in one place
+    headers = response.headers
+    for key, value in _RESPONSE_HEADERS:
+        headers[key] = value
     return response
 
 @app.before_request
@@ -180,7 +447,7 @@ def test_connection():
         "success": True,
         "message": "Backend connected successfully!",
         "timestamp": datetime.now().isoformat(),
-        "active_sessions": len(active_sessions)
+        "active_sessions": _session_count()
     })
 
 @app.route('/health', methods=['GET', 'OPTIONS'])
@@ -192,9 +459,9 @@ def create_voice_session():
     """Create a new voice analysis session"""
     try:
         session_id = str(uuid.uuid4())
-        active_sessions[session_id] = VoiceAnalysisSession(session_id)
+        _put_session(VoiceAnalysisSession(session_id))
         
-        print(f"Created voice session: {session_id}")  # Debug log
+        log.debug("Created voice session: %s", session_id)
         
         return jsonify({
             "success": True,
@@ -203,23 +470,24 @@ def create_voice_session():
         }), 201
         
     except Exception as e:
-        print(f"Session creation error: {e}")  # Debug log
+        log.error("Session creation error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voice/session/<session_id>/start', methods=['POST', 'OPTIONS'])
 def start_recording(session_id):
     """Start recording for a session (equivalent to 's' command)"""
     try:
-        print(f"Attempting to start recording for session: {session_id}")  # Debug log
+        log.debug("Attempting to start recording for session: %s", session_id)
         
-        if session_id not in active_sessions:
-            print(f"Session {session_id} not found in active_sessions")  # Debug log
+        session = _get_session(session_id)
+        if session is None:
+            log.debug("Session %s not found in active sessions", session_id)
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
+
         session.start_recording()
-        
-        print(f"Recording started for session: {session_id}")  # Debug log
+        _save_session(session)
+
+        log.debug("Recording started for session: %s", session_id)
         
         return jsonify({
             "success": True,
@@ -228,120 +496,155 @@ def start_recording(session_id):
         })
         
     except Exception as e:
-        print(f"Start recording error: {e}")  # Debug log
+        log.error("Start recording error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voice/session/<session_id>/stop', methods=['POST', 'OPTIONS'])
 def stop_recording(session_id):
     """Stop recording for a session (equivalent to 'x' command)"""
     try:
-        print(f"Attempting to stop recording for session: {session_id}")  # Debug log
+        log.debug("Attempting to stop recording for session: %s", session_id)
         
-        if session_id not in active_sessions:
-            print(f"Session {session_id} not found for stop")  # Debug log
+        session = _get_session(session_id)
+        if session is None:
+            log.debug("Session %s not found for stop", session_id)
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
+
         session.stop_recording()
-        
-        # Generate comprehensive analysis
-        analysis = analyze_speech_performance(session.transcript, session.live_stats, session.analysis_history)
-        session.analysis_history.append(analysis)
-        
-        print(f"Recording stopped for session: {session_id}")  # Debug log
-        
+
+        # Generate the comprehensive analysis off the request thread; clients
+        # poll /analysis for the result instead of waiting on Gemini here
+        def run_analysis():
+            analysis = analyze_speech_performance(session.transcript, session.stats_dict(), session.analysis_history)
+            session.analysis_history.append(analysis)
+            _save_session(session)
+            return analysis
+
+        session.pending_analysis = ANALYSIS_POOL.submit(run_analysis)
+        _save_session(session)
+
+        log.debug("Recording stopped for session: %s, analysis submitted", session_id)
+
         return jsonify({
             "success": True,
-            "message": "Recording stopped",
+            "message": "Recording stopped, analysis in progress",
             "is_recording": False,
-            "analysis": analysis
-        })
+            "analysis_pending": True
+        }), 202
         
     except Exception as e:
-        print(f"Stop recording error: {e}")  # Debug log
+        log.error("Stop recording error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voice/session/<session_id>/audio', methods=['POST', 'OPTIONS'])
 def process_audio_chunk(session_id):
     """Process audio chunk and update live stats"""
     try:
-        if session_id not in active_sessions:
-            print(f"Session {session_id} not found")
+        # Hold the shard lock only for the lookup, then release before heavy work
+        session = _get_session(session_id)
+        if session is None:
+            log.debug("Session %s not found", session_id)
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
-        
+
         # Allow processing even if recording just stopped - speech recognition can have delayed final results
         # if not session.is_recording:
         #     print(f"Session {session_id} not recording")
         #     return jsonify({"error": "Session not recording"}), 400
         
-        data = request.get_json()
-        if not data:
-            print("No data provided in request")
-            return jsonify({"error": "No data provided"}), 400
-            
+        if request.content_type and request.content_type.startswith('application/octet-stream'):
+            # Raw binary variant: PCM16 body, no base64 or JSON envelope
+            # (~33% smaller payload and no decode copy)
+            audio_bytes = request.get_data(cache=False)
+            text_chunk = request.args.get('text_chunk', '').strip()
+        else:
+            data = request.get_json()
+            if not data:
+                log.debug("No data provided in request")
+                return jsonify({"error": "No data provided"}), 400
+
+            text_chunk = data.get('text_chunk', '').strip()
+            audio_bytes = b''
+            if data.get('audio_data'):
+                try:
+                    audio_bytes = binascii.a2b_base64(data['audio_data'])
+                except binascii.Error as decode_error:
+                    log.error("Base64 decode error: %s", decode_error)
+
         # Debug: Print what we received
-        text_chunk = data.get('text_chunk', '').strip()
-        has_audio = bool(data.get('audio_data'))
-        print(f"Processing for session {session_id}: text='{text_chunk}', has_audio={has_audio}, is_recording={session.is_recording}")
-        
+        log.debug("Processing for session %s: text='%s', has_audio=%s, is_recording=%s", session_id, text_chunk, bool(audio_bytes), session.is_recording)
+
         audio_data = None
-        if 'audio_data' in data and data['audio_data']:
+        pooled_buf = None
+        if audio_bytes:
             try:
-                # Decode base64 audio data
-                audio_bytes = base64.b64decode(data['audio_data'])
-                if len(audio_bytes) > 0:
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-                    audio_data = audio_array
-                    print(f"Processed audio chunk: {len(audio_data)} samples")
+                # Zero-copy int16 view, fused into a single float32 array
+                i16 = np.frombuffer(audio_bytes, dtype=np.int16)
+                if i16.size == 0 or max(int(i16.max()), -int(i16.min())) < SILENCE_I16:
+                    # Silence frame: decay the volume and skip the float
+                    # conversion and RMS work entirely
+                    session.live_stats[_VOLUME] *= 0.9
+                    log.debug("Silence frame, skipped RMS")
+                elif len(i16) == AUDIO_POOL.size:
+                    # Standard-size chunk: reuse a pooled buffer
+                    pooled_buf = AUDIO_POOL.acquire()
+                    np.multiply(i16, _INV_32768, out=pooled_buf)
+                    audio_data = pooled_buf
+                else:
+                    # Non-standard size: fall back to a fresh allocation
+                    audio_data = np.multiply(i16, _INV_32768, dtype=np.float32)
+                if audio_data is not None:
+                    log.debug("Processed audio chunk: %s samples", len(audio_data))
             except Exception as audio_error:
-                print(f"Audio processing error: {audio_error}")
+                log.error("Audio processing error: %s", audio_error)
                 # Continue without audio data
-        
+
         # Update live statistics
-        if text_chunk or audio_data is not None:
-            print(f"Before update - total_words: {session.total_words}, speaking_rate: {session.live_stats['speaking_rate']}")
-            session.update_live_stats(audio_data, text_chunk)
-            print(f"After update - total_words: {session.total_words}, speaking_rate: {session.live_stats['speaking_rate']}")
-            print(f"Current stats: {session.live_stats}")
-        else:
-            print("No text or audio data to process")
-        
-        return jsonify({
+        try:
+            if text_chunk or audio_data is not None:
+                log.debug("Before update - total_words: %s, speaking_rate: %s", session.total_words, session.live_stats[_SPEAKING_RATE])
+                session.update_live_stats(audio_data, text_chunk)
+                _save_session(session, throttled=True)
+                log.debug("After update - total_words: %s, speaking_rate: %s", session.total_words, session.live_stats[_SPEAKING_RATE])
+                log.debug("Current stats: %s", session.live_stats)
+            else:
+                log.debug("No text or audio data to process")
+        finally:
+            if pooled_buf is not None:
+                AUDIO_POOL.release(pooled_buf)
+        
+        return ojson({
             "success": True,
-            "live_stats": session.live_stats,
-            "transcript_length": len(session.transcript.split()),
+            "live_stats": session.stats_dict(),
+            "transcript_length": session.total_words,
             "audio_processed": audio_data is not None,
             "text_received": bool(text_chunk),
             "current_transcript": session.transcript  # Debug: show what transcript we have
         })
         
     except Exception as e:
-        print(f"Process audio chunk error: {e}")
+        log.error("Process audio chunk error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voice/session/<session_id>/stats', methods=['GET', 'OPTIONS'])
 def get_live_stats(session_id):
     """Get current live statistics"""
     try:
-        if session_id not in active_sessions:
+        session = _get_session(session_id)
+        if session is None:
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
-        
+
         # Debug info
-        print(f"Stats request for session {session_id}:")
-        print(f"  - Is recording: {session.is_recording}")
-        print(f"  - Total words: {session.total_words}")
-        print(f"  - Transcript length: {len(session.transcript)}")
-        print(f"  - Current stats: {session.live_stats}")
+        log.debug("Stats request for session %s:", session_id)
+        log.debug("  - Is recording: %s", session.is_recording)
+        log.debug("  - Total words: %s", session.total_words)
+        log.debug("  - Transcript length: %s", len(session.transcript))
+        log.debug("  - Current stats: %s", session.live_stats)
         
-        return jsonify({
+        return ojson({
             "success": True,
-            "live_stats": session.live_stats,
+            "live_stats": session.stats_dict(),
             "is_recording": session.is_recording,
-            "transcript_length": len(session.transcript.split()),
+            "transcript_length": session.total_words,
             "debug_info": {
                 "total_words": session.total_words,
                 "transcript_chars": len(session.transcript),
@@ -350,22 +653,21 @@ def get_live_stats(session_id):
         })
         
     except Exception as e:
-        print(f"Get stats error: {e}")
+        log.error("Get stats error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/voice/session/<session_id>/transcript', methods=['GET'])
 def get_transcript(session_id):
     """Get full transcript for notes tab"""
     try:
-        if session_id not in active_sessions:
+        session = _get_session(session_id)
+        if session is None:
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
-        
-        return jsonify({
+
+        return ojson({
             "success": True,
             "transcript": session.transcript,
-            "word_count": len(session.transcript.split()),
+            "word_count": session.total_words,
             "duration": time.time() - session.start_time if session.start_time else 0
         })
         
@@ -376,11 +678,22 @@ def get_transcript(session_id):
 def get_speech_analysis(session_id):
     """Get speech coaching analysis for tips tab"""
     try:
-        if session_id not in active_sessions:
+        session = _get_session(session_id)
+        if session is None:
             return jsonify({"error": "Session not found"}), 404
-            
-        session = active_sessions[session_id]
-        
+
+        # If an analysis is still running, tell the client to keep polling
+        future = session.pending_analysis
+        if future is not None:
+            if not future.done():
+                return jsonify({
+                    "success": True,
+                    "status": "pending",
+                    "message": "Analysis still in progress",
+                    "analysis": None
+                }), 202
+            session.pending_analysis = None
+
         if not session.analysis_history:
             return jsonify({
                 "success": True,
@@ -404,9 +717,8 @@ def get_speech_analysis(session_id):
 def delete_voice_session(session_id):
     """Delete a voice analysis session"""
     try:
-        if session_id in active_sessions:
-            del active_sessions[session_id]
-            print(f"Deleted session: {session_id}")  # Debug log
+        if _pop_session(session_id) is not None:
+            log.debug("Deleted session: %s", session_id)
             
         return jsonify({
             "success": True,
@@ -441,7 +753,7 @@ def create_transcription():
         transcription['analysis'] = analysis
         
         # Store transcription
-        transcriptions.append(transcription)
+        transcriptions[transcription['id']] = transcription
         
         return jsonify({
             "success": True,
@@ -461,8 +773,8 @@ def get_transcriptions():
         # Calculate pagination
         start = (page - 1) * limit
         end = start + limit
-        
-        paginated_transcriptions = transcriptions[start:end]
+
+        paginated_transcriptions = list(islice(transcriptions.values(), start, end))
         
         return jsonify({
             "success": True,
@@ -481,7 +793,7 @@ def get_transcriptions():
 @app.route('/api/transcriptions/<transcription_id>', methods=['GET'])
 def get_transcription(transcription_id):
     try:
-        transcription = next((t for t in transcriptions if t['id'] == transcription_id), None)
+        transcription = transcriptions.get(transcription_id)
         
         if not transcription:
             return jsonify({"error": "Transcription not found"}), 404
@@ -497,11 +809,7 @@ def get_transcription(transcription_id):
 @app.route('/api/transcriptions/<transcription_id>', methods=['DELETE'])
 def delete_transcription(transcription_id):
     try:
-        global transcriptions
-        original_length = len(transcriptions)
-        transcriptions = [t for t in transcriptions if t['id'] != transcription_id]
-        
-        if len(transcriptions) == original_length:
+        if transcriptions.pop(transcription_id, None) is None:
             return jsonify({"error": "Transcription not found"}), 404
         
         return jsonify({
@@ -571,55 +879,25 @@ def analyze_speech_performance(transcript, live_stats, history):
                 "progress_notes": f"Session #{len(history) + 1} - Brief session completed"
             }
 
-        prompt = f"""
-        As an expert speech coach, analyze this speaking performance:
+        prompt = _COACH_PROMPT_TEMPLATE.format(
+            transcript=transcript,
+            fluency=live_stats.get('fluency', 0),
+            volume=live_stats.get('volume', 0),
+            articulation=live_stats.get('articulation', 0),
+            filler_words=live_stats.get('filler_words', 0),
+            speaking_rate=live_stats.get('speaking_rate', 0),
+            confidence=live_stats.get('confidence', 0),
+            clarity=live_stats.get('clarity', 0),
+            session_count=len(history)
+        )
 
-        TRANSCRIPT: "{transcript}"
-        
-        LIVE STATISTICS:
-        - Fluency Score: {live_stats.get('fluency', 0)}/100
-        - Volume Level: {live_stats.get('volume', 0)}/100
-        - Articulation: {live_stats.get('articulation', 0)}/100
-        - Filler Words: {live_stats.get('filler_words', 0)}%
-        - Speaking Rate: {live_stats.get('speaking_rate', 0)} WPM
-        - Confidence: {live_stats.get('confidence', 0)}/100
-        - Clarity: {live_stats.get('clarity', 0)}/100
-        
-        SESSION COUNT: {len(history)} (previous sessions)
-
-        Please provide coaching feedback in this EXACT JSON format:
-        {{
-            "observations": [
-                "Specific observation about tone/delivery",
-                "Observation about word choice/clarity", 
-                "Observation about pacing/flow"
-            ],
-            "improvements": [
-                "Specific actionable tip",
-                "Another concrete suggestion"
-            ],
-            "strengths": [
-                "What they did well"
-            ],
-            "overall_score": 7,
-            "quick_tip": "One-sentence practical advice",
-            "progress_notes": "Comment on improvement from previous sessions (if any)"
-        }}
-        
-        Be encouraging but honest. Focus on practical, actionable advice.
-        """
-        
         response = model.generate_content(prompt)
-        
+
         # Try to parse as JSON, fallback to structured text if it fails
         try:
-            # Clean the response text
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:-3]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:-3]
-            
+            # Clean the response text: drop any surrounding markdown fences
+            response_text = _FENCE_RE.sub('', response.text).strip()
+
             analysis = json.loads(response_text)
             
             # Validate required fields
@@ -629,7 +907,7 @@ def analyze_speech_performance(transcript, live_stats, history):
                     raise ValueError(f"Missing required field: {field}")
             
         except (json.JSONDecodeError, ValueError) as e:
-            print(f"JSON parsing error: {e}, Raw response: {response.text}")
+            log.error("JSON parsing error: %s, Raw response: %s", e, response.text)
             # Enhanced fallback structure
             word_count = len(transcript.split())
             filler_ratio = live_stats.get('filler_words', 0)
@@ -657,7 +935,7 @@ def analyze_speech_performance(transcript, live_stats, history):
         return analysis
         
     except Exception as e:
-        print(f"Analysis error: {e}")
+        log.error("Analysis error: %s", e)
         return {
             "error": f"Analysis temporarily unavailable: {str(e)}",
             "observations": ["Speech analysis is currently unavailable", "Technical issue encountered", "Your speech was recorded successfully"],
@@ -745,7 +1023,7 @@ def summarize_with_gemini(text):
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8000))
     debug = os.getenv('FLASK_ENV') == 'development'
-    print(f"Starting Flask server on port {port}")
-    print(f"CORS configured for http://localhost:3000")
-    print(f"Active sessions storage initialized")
+    log.info("Starting Flask server on port %s", port)
+    log.info("CORS configured for http://localhost:3000")
+    log.info("Active sessions storage initialized")
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -7,43 +7,56 @@ import base64
 import os
 from typing import Optional
 from dotenv import load_dotenv
+try:
+    import orjson  # C-implemented JSON for the per-frame send/receive path
+except ImportError:
+    orjson = None
+try:
+    import pybase64  # SIMD base64 (AVX2/NEON), drop-in for the stdlib encoder
+    _b64encode = pybase64.b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+try:
+    from aioconsole import ainput as _ainput  # one dedicated stdin reader
+except ImportError:
+    async def _ainput(prompt: str = "") -> str:
+        return await asyncio.get_event_loop().run_in_executor(None, input, prompt)
 
-# Load environment variables from .env file
-load_dotenv()
+if orjson is not None:
+    _dumps = orjson.dumps  # returns bytes, sent as a binary frame
+    _loads = orjson.loads  # accepts str or bytes directly
+else:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
 
-class GeminiLiveClient:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.websocket = None
-        self.sample_rate = 16000  # Gemini Live API supports 16kHz
-        self.connected = False
-        
-    async def connect(self, model: str = "gemini-2.0-flash-exp"):
-        """Connect to Gemini Live API via WebSocket"""
-        # WebSocket endpoint for Gemini Live API
-        uri = f"wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1alpha.GenerativeService.BidiGenerateContent?key={self.api_key}"
-        
-        try:
-            self.websocket = await websockets.connect(uri)
-            self.connected = True
-            
-            # Configure the session with speech coaching instructions
-            setup_message = {
-                "setup": {
-                    "model": f"models/{model}",
-                    "generation_config": {
-                        "response_modalities": ["TEXT"],  # Focus on text feedback for detailed analysis
-                        "speech_config": {
-                            "voice_config": {
-                                "prebuilt_voice_config": {
-                                    "voice_name": "Aoede"
-                                }
-                            }
-                        }
-                    },
-                    "system_instruction": {
-                        "parts": [{
-                            "text": """You are an expert speech coach and communication analyst. Your role is to:
+CHUNK_SAMPLES = 1600  # ~100ms at 16kHz, the streaming chunk size
+
+try:
+    import msgspec
+
+    # Known response schema: msgspec decodes straight into these structs and
+    # only materializes the fields we actually read
+    class _Part(msgspec.Struct):
+        text: Optional[str] = None
+        inlineData: Optional[dict] = None
+
+    class _ModelTurn(msgspec.Struct):
+        parts: list[_Part] = []
+
+    class _ServerContent(msgspec.Struct):
+        modelTurn: Optional[_ModelTurn] = None
+
+    class _Frame(msgspec.Struct):
+        serverContent: Optional[_ServerContent] = None
+        setupComplete: Optional[dict] = None
+        error: Optional[dict] = None
+
+    _FRAME_DECODER = msgspec.json.Decoder(_Frame)
+except ImportError:
+    _FRAME_DECODER = None
+
+_SYSTEM_PROMPT = """You are an expert speech coach and communication analyst. Your role is to:
 
 1. **ANALYZE SPEAKING PATTERNS**: Listen carefully to the user's voice and analyze:
    - Tone of voice (confident, hesitant, monotone, energetic, etc.)
@@ -69,59 +82,218 @@ class GeminiLiveClient:
 
 4. **FORMAT YOUR RESPONSE** like this:
    📊 **SPEAKING ANALYSIS**
-   
+
    🎯 **What I Observed:**
    - [Specific observation about tone/delivery]
    - [Observation about word choice/clarity]
    - [Observation about pacing/flow]
-   
+
    💡 **Suggestions for Improvement:**
    - [Specific actionable tip]
    - [Another concrete suggestion]
-   
+
    ✨ **What You Did Well:**
    - [Positive reinforcement]
-   
+
    📈 **Overall Score:** X/10
-   
+
    🗣️ **Quick Tip:** [One-sentence practical advice]
 
 Be encouraging but honest. Focus on practical, actionable advice they can implement immediately."""
-                        }]
+
+# Session setup frame, serialized once at import; connect() just patches in
+# the model id and sends the bytes
+_SETUP_TEMPLATE = _dumps({
+    "setup": {
+        "model": "models/__MODEL__",
+        "generation_config": {
+            "response_modalities": ["TEXT"],  # Focus on text feedback for detailed analysis
+            "speech_config": {
+                "voice_config": {
+                    "prebuilt_voice_config": {
+                        "voice_name": "Aoede"
                     }
                 }
             }
-            
-            await self.websocket.send(json.dumps(setup_message))
+        },
+        "system_instruction": {
+            "parts": [{
+                "text": _SYSTEM_PROMPT
+            }]
+        }
+    }
+})
+
+# The audio envelope never varies, so it is pre-serialized as byte halves:
+# each send is prefix + base64 payload(s) + suffix with no JSON call at all
+_AUDIO_PREFIX = b'{"realtime_input":{"media_chunks":[{"mime_type":"audio/pcm","data":"'
+_AUDIO_SEP = b'"},{"mime_type":"audio/pcm","data":"'
+_AUDIO_SUFFIX = b'"}]}}'
+
+try:
+    import numba
+
+    @numba.njit(cache=True, fastmath=True)
+    def _f32_to_i16(src, dst, scratch):
+        """Fused scale+saturate+cast of float32 samples into an int16 buffer"""
+        for i in range(src.size):
+            v = src[i] * 32767.0
+            if v > 32767.0:
+                v = 32767.0
+            elif v < -32768.0:
+                v = -32768.0
+            dst[i] = np.int16(v)
+
+    @numba.njit(cache=True, fastmath=True)
+    def _downmix_i16(src, dst):
+        """Average int16 channels into a mono int16 buffer in one pass"""
+        nch = src.shape[1]
+        for i in range(src.shape[0]):
+            acc = 0
+            for c in range(nch):
+                acc += src[i, c]
+            dst[i] = np.int16(acc // nch)
+
+    # Warm both kernels at import so the first realtime block never pays
+    # JIT compile (or cache-load) latency on the audio thread
+    _f32_to_i16(np.zeros(1, dtype=np.float32), np.empty(1, dtype=np.int16),
+                np.empty(1, dtype=np.float32))
+    _downmix_i16(np.zeros((1, 2), dtype=np.int16), np.empty(1, dtype=np.int16))
+except ImportError:
+    def _f32_to_i16(src, dst, scratch):
+        """Scale+saturate+cast via in-place NumPy ops on a reusable scratch"""
+        tmp = scratch[:src.size]
+        np.multiply(src, 32767.0, out=tmp)
+        np.clip(tmp, -32768.0, 32767.0, out=tmp)
+        dst[:src.size] = tmp  # casts on assignment, no fresh allocation
+
+    def _downmix_i16(src, dst):
+        """Average int16 channels into a mono int16 buffer"""
+        # int32 accumulator avoids overflow; assignment casts back to int16
+        dst[:] = src.sum(axis=1, dtype=np.int32) // src.shape[1]
+
+# Load environment variables from .env file
+load_dotenv()
+
+class GeminiLiveClient:
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.websocket = None
+        self.sample_rate = 16000  # Gemini Live API supports 16kHz
+        self.connected = False
+        # Reusable conversion buffers for the standard chunk size
+        self._pcm_scratch = np.empty(CHUNK_SAMPLES, dtype=np.int16)
+        self._f32_scratch = np.empty(CHUNK_SAMPLES, dtype=np.float32)
+        # Reusable frame-assembly buffer for the batching sender
+        self._frame_buf = bytearray()
+        # Outbound audio queue drained by the batching sender task
+        self._audio_q: Optional[asyncio.Queue] = None
+        self._sender_task = None
+        
+    async def connect(self, model: str = "gemini-2.0-flash-exp"):
+        """Connect to Gemini Live API via WebSocket"""
+        # WebSocket endpoint for Gemini Live API
+        uri = f"wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1alpha.GenerativeService.BidiGenerateContent?key={self.api_key}"
+        
+        try:
+            # compression=None: base64 PCM barely deflates, so permessage-deflate
+            # would burn CPU on every 10 Hz audio frame for nothing
+            self.websocket = await websockets.connect(
+                uri,
+                compression=None,
+                max_size=2 ** 23,
+                write_limit=2 ** 18,
+            )
+            self.connected = True
+
+            # Configure the session with the pre-serialized setup frame
+            await self.websocket.send(_SETUP_TEMPLATE.replace(b"__MODEL__", model.encode()))
+
+            # Start the sender that batches queued audio into single frames.
+            # Bounded so a slow network drops stale audio instead of
+            # accumulating chunks without limit (~1s of backlog at 10 Hz).
+            self._audio_q = asyncio.Queue(maxsize=10)
+            self._sender_task = asyncio.create_task(self._audio_sender())
             print("🔗 Connected to Gemini Live API")
             
         except Exception as e:
             print(f"❌ Connection failed: {e}")
             self.connected = False
             
-    async def send_audio_chunk(self, audio_data: np.ndarray):
-        """Send audio data to Gemini"""
-        if not self.connected or not self.websocket:
+    def _encode_chunk(self, audio_data: np.ndarray) -> bytes:
+        """Convert one chunk to base64 PCM16 for the wire.
+
+        Device-native int16 PCM needs no conversion; float input is
+        converted with saturation, reusing scratch buffers for the
+        standard chunk size.
+        """
+        n = len(audio_data)
+        if audio_data.dtype == np.int16:
+            pcm_data = audio_data
+        elif n <= CHUNK_SAMPLES:
+            pcm_data = self._pcm_scratch[:n]
+            _f32_to_i16(audio_data, pcm_data, self._f32_scratch)
+        else:
+            pcm_data = np.empty(n, dtype=np.int16)
+            _f32_to_i16(audio_data, pcm_data, np.empty(n, dtype=np.float32))
+        # Encode straight from the int16 buffer - no tobytes() copy
+        return _b64encode(memoryview(pcm_data).cast('B'))
+
+    def enqueue_audio_chunk(self, audio_data: np.ndarray):
+        """Hand a raw chunk to the sender; runs on the event loop thread.
+
+        The capture thread schedules this via loop.call_soon_threadsafe so
+        no coroutine or Future is allocated in the realtime callback. Under
+        backpressure the oldest queued chunk is dropped: stale audio is
+        worth less than fresh audio, and memory stays bounded.
+        """
+        q = self._audio_q
+        if not self.connected or q is None:
             return
-            
         try:
-            # Convert float32 to int16 PCM
-            pcm_data = (audio_data * 32767).astype(np.int16)
-            audio_base64 = base64.b64encode(pcm_data.tobytes()).decode()
-            
-            message = {
-                "realtime_input": {
-                    "media_chunks": [{
-                        "mime_type": "audio/pcm",
-                        "data": audio_base64
-                    }]
-                }
-            }
-            
-            await self.websocket.send(json.dumps(message))
-            
-        except Exception as e:
-            print(f"❌ Error sending audio: {e}")
+            q.put_nowait(audio_data)
+        except asyncio.QueueFull:
+            try:
+                q.get_nowait()  # drop the oldest chunk
+            except asyncio.QueueEmpty:
+                pass
+            q.put_nowait(audio_data)
+
+    async def send_audio_chunk(self, audio_data: np.ndarray):
+        """Send audio data to Gemini (queued for the batching sender)"""
+        self.enqueue_audio_chunk(audio_data)
+
+    async def _audio_sender(self):
+        """Drain the audio queue and send one frame per batch.
+
+        Encoding happens here on the event loop, off the capture thread, and
+        the JSON envelope and WebSocket frame overhead are amortized over
+        every chunk that accumulated since the last send.
+        """
+        while True:
+            batch = [await self._audio_q.get()]
+            while True:
+                try:
+                    batch.append(self._audio_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                # Splice base64 payloads into the constant envelope instead of
+                # serializing the same dict structure on every send. The
+                # assembly buffer is cleared and reused so steady-state sends
+                # allocate nothing but the base64 output itself.
+                buf = self._frame_buf
+                del buf[:]
+                buf += _AUDIO_PREFIX
+                for i, chunk in enumerate(batch):
+                    if i:
+                        buf += _AUDIO_SEP
+                    buf += self._encode_chunk(chunk)
+                buf += _AUDIO_SUFFIX
+                await self.websocket.send(buf)
+            except Exception as e:
+                print(f"❌ Error sending audio batch: {e}")
     
     async def send_text(self, text: str):
         """Send text message to Gemini"""
@@ -141,7 +313,7 @@ Be encouraging but honest. Focus on practical, actionable advice they can implem
                 }
             }
             
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(_dumps(message))
             print(f"💬 Sent: {text}")
             
         except Exception as e:
@@ -155,32 +327,47 @@ Be encouraging but honest. Focus on practical, actionable advice they can implem
         try:
             async for message in self.websocket:
                 try:
-                    data = json.loads(message)
-                    
-                    # Handle different response types
-                    if "serverContent" in data:
-                        server_content = data["serverContent"]
-                        
-                        if "modelTurn" in server_content:
-                            model_turn = server_content["modelTurn"]
-                            
-                            # Handle text responses
-                            if "parts" in model_turn:
-                                for part in model_turn["parts"]:
-                                    if "text" in part:
-                                        print(f"🤖 Gemini: {part['text']}")
-                                    elif "inlineData" in part:
+                    if _FRAME_DECODER is not None:
+                        # Schema-driven decode straight into structs
+                        frame = _FRAME_DECODER.decode(message)
+                        sc = frame.serverContent
+                        if sc is not None:
+                            if sc.modelTurn is not None:
+                                for part in sc.modelTurn.parts:
+                                    if part.text is not None:
+                                        print(f"🤖 Gemini: {part.text}")
+                                    elif part.inlineData is not None:
                                         # Handle audio responses
                                         print("🎵 Received audio response")
                                         # You could decode and play the audio here
-                                        
+                        elif frame.setupComplete is not None:
+                            print("✅ Setup complete - ready for interaction")
+                        elif frame.error is not None:
+                            print(f"❌ API Error: {frame.error}")
+                        continue
+
+                    # Fallback: plain JSON decode with a single get() per
+                    # level - no membership test followed by a second lookup
+                    data = _loads(message)
+
+                    server_content = data.get("serverContent")
+                    if server_content is not None:
+                        model_turn = server_content.get("modelTurn")
+                        if model_turn is not None:
+                            for part in model_turn.get("parts", ()):
+                                text = part.get("text")
+                                if text is not None:
+                                    print(f"🤖 Gemini: {text}")
+                                elif part.get("inlineData") is not None:
+                                    # Handle audio responses
+                                    print("🎵 Received audio response")
+                                    # You could decode and play the audio here
                     elif "setupComplete" in data:
                         print("✅ Setup complete - ready for interaction")
-                        
                     elif "error" in data:
                         print(f"❌ API Error: {data['error']}")
-                        
-                except json.JSONDecodeError:
+
+                except ValueError:
                     print(f"❌ Failed to parse message: {message}")
                     
         except Exception as e:
@@ -188,6 +375,9 @@ Be encouraging but honest. Focus on practical, actionable advice they can implem
     
     async def disconnect(self):
         """Disconnect from the API"""
+        if self._sender_task:
+            self._sender_task.cancel()
+            self._sender_task = None
         if self.websocket:
             await self.websocket.close()
             self.connected = False
@@ -196,35 +386,86 @@ Be encouraging but honest. Focus on practical, actionable advice they can implem
 class AudioStreamer:
     def __init__(self, client: GeminiLiveClient):
         self.client = client
-        self.audio_buffer = []
         self.buffer_size = 1600  # ~100ms at 16kHz
+        # Fallback ring buffer for devices that don't honor the requested
+        # blocksize: the callback copies device blocks in and carves
+        # contiguous chunks out, with no Python-list boxing.
+        self._ring = np.empty(self.buffer_size * 8, dtype=np.int16)
         self.is_recording = False
         self.loop = None  # Store the event loop reference
         self.recording_session = 0  # Track recording sessions for feedback
-        
-    def audio_callback(self, indata, frames, time, status):
-        """Audio input callback"""
-        if status:
-            print(f"Audio status: {status}")
-            
-        if not self.is_recording or not self.loop:
-            return
-            
-        # Convert to mono
-        mono_data = indata[:, 0] if len(indata.shape) > 1 else indata
-        self.audio_buffer.extend(mono_data)
-        
-        # Send audio in chunks
-        while len(self.audio_buffer) >= self.buffer_size:
-            chunk = np.array(self.audio_buffer[:self.buffer_size])
-            self.audio_buffer = self.audio_buffer[self.buffer_size:]
-            
-            # Send audio chunk asynchronously using the stored loop reference
-            asyncio.run_coroutine_threadsafe(
-                self.client.send_audio_chunk(chunk),
-                self.loop
-            )
-    
+
+    def _make_audio_callback(self):
+        """Build the InputStream callback with hot state bound to locals.
+
+        Every attribute the realtime audio thread touches on each block is
+        captured in the closure, so the callback does no repeated lookups.
+        Only is_recording is read off self because commands toggle it.
+        The ring read/write counters live as closure locals; the callback
+        is the only code that uses them.
+        """
+        call_soon = self.loop.call_soon_threadsafe
+        enqueue = self.client.enqueue_audio_chunk
+        buffer_size = self.buffer_size
+        ring = self._ring
+        cap = ring.size
+        w = 0  # monotonically increasing sample counters
+        r = 0
+        streamer = self
+        mono_buf = np.empty(buffer_size, dtype=np.int16)  # downmix scratch
+
+        def audio_callback(indata, frames, time, status):
+            nonlocal w, r
+            if status:
+                print(f"Audio status: {status}")
+
+            if not streamer.is_recording:
+                return
+
+            # Convert to mono: a real downmix for multi-channel capture
+            # rather than dropping every channel but the first
+            if indata.ndim > 1 and indata.shape[1] > 1:
+                n = len(indata)
+                mono_data = (mono_buf[:n] if n <= buffer_size
+                             else np.empty(n, dtype=np.int16))
+                _downmix_i16(indata, mono_data)
+            elif indata.ndim > 1:
+                mono_data = indata[:, 0]
+            else:
+                mono_data = indata
+
+            # Fast path: with blocksize matched to buffer_size the device
+            # hands us exactly one chunk per callback - no rechunking at all
+            if len(mono_data) == buffer_size:
+                call_soon(enqueue, mono_data.copy())
+                return
+
+            # Copy the device block into the ring (two copies if it wraps)
+            n = len(mono_data)
+            if n > cap - (w - r):
+                # Sender fell behind and the ring is full: drop the oldest
+                r = w + n - cap
+            pos = w % cap
+            first = min(n, cap - pos)
+            ring[pos:pos + first] = mono_data[:first]
+            if first < n:
+                ring[:n - first] = mono_data[first:]
+            w += n
+
+            # Send audio in chunks
+            while w - r >= buffer_size:
+                pos = r % cap
+                end = pos + buffer_size
+                if end <= cap:
+                    chunk = ring[pos:end].copy()  # copy: sent asynchronously
+                else:
+                    chunk = np.concatenate((ring[pos:], ring[:end - cap]))
+                r += buffer_size
+                call_soon(enqueue, chunk)
+
+        return audio_callback
+
+
     def start_recording(self):
         """Start recording audio"""
         self.is_recording = True
@@ -285,14 +526,13 @@ Please be detailed and actionable in your feedback."""
         with sd.InputStream(
             channels=1,
             samplerate=self.client.sample_rate,
-            dtype=np.float32,
-            callback=self.audio_callback
+            dtype=np.int16,  # capture device-native PCM16, no float conversion
+            blocksize=self.buffer_size,  # one chunk per callback
+            callback=self._make_audio_callback()
         ):
             try:
                 while True:
-                    command = await asyncio.get_event_loop().run_in_executor(
-                        None, input, "\n📱 Enter command: "
-                    )
+                    command = await _ainput("\n📱 Enter command: ")
                     
                     if command.lower() == 's':
                         if not self.is_recording:
@@ -304,9 +544,7 @@ Please be detailed and actionable in your feedback."""
                     elif command.lower() == 'a':
                         await self.request_speech_analysis()
                     elif command.lower() == 't':
-                        text = await asyncio.get_event_loop().run_in_executor(
-                            None, input, "💬 Enter text: "
-                        )
+                        text = await _ainput("💬 Enter text: ")
                         await self.client.send_text(text)
                     elif command.lower() == 'q':
                         if self.is_recording:
@@ -343,4 +581,9 @@ async def main():
     await streamer.start_streaming()
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # C event loop: cuts asyncio overhead on the frame path
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
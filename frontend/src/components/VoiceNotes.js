@@ -525,6 +525,24 @@ const WidgetApp = () => {
     }
   };
 
+  /** --- Poll for Analysis --- **/
+  const pollForAnalysis = async (maxAttempts = 30, intervalMs = 1000) => {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      const response = await fetch(`${API_BASE_URL}/voice/session/${sessionId}/analysis`);
+      if (response.ok && response.status !== 202) {
+        const data = await response.json();
+        if (data.success && data.analysis) {
+          return data.analysis;
+        }
+        if (!data.success) {
+          break;
+        }
+      }
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+    return null;
+  };
+
   /** --- Stop Recording --- **/
   const stopRecording = async () => {
     if (!sessionId || !isRecording) return;
@@ -566,6 +584,14 @@ const WidgetApp = () => {
           setSpeechAnalysis(data.analysis);
           setActiveTab("tips");
           console.log('Analysis received:', data.analysis);
+        } else if (data.analysis_pending) {
+          // Analysis runs in the background; poll until it's ready
+          const analysis = await pollForAnalysis();
+          if (analysis) {
+            setSpeechAnalysis(analysis);
+            setActiveTab("tips");
+            console.log('Analysis received:', analysis);
+          }
         }
       } else {
         throw new Error(data.error || 'Failed to stop recording session');